@@ -1,18 +1,59 @@
 from datetime import datetime
+from functools import lru_cache
 import os
-from azure.storage.blob import BlobServiceClient, ContainerClient
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobProperties, BlobServiceClient, ContainerClient
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azure.storage.blob.aio import ContainerClient as AsyncContainerClient
+
+# The SDK default pool (10 connections) starves parallel chunked transfers.
+POOL_SIZE = 64
+MAX_CONCURRENCY = 16
+MAX_SINGLE_GET_SIZE = 64 * 1024 * 1024
+MAX_CHUNK_GET_SIZE = 16 * 1024 * 1024
+
+
+def _build_transport() -> RequestsTransport:
+    """
+    Build a requests transport with a connection pool large enough for
+    concurrent chunked uploads and downloads.
+    """
+    session = requests.Session()
+    # Retries are handled by the Azure pipeline, as in the SDK's own adapter.
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session)
+
+
+def _get_connection_string() -> str:
+    connstr = os.getenv("CONTENT_STORAGE_CONNSTRING")
+    if not connstr:
+        raise ValueError(
+            "CONTENT_STORAGE_CONNSTRING is required. Configure your environment."
+        )
+    return connstr
 
 
 class AzureBlobContainer:
     container_client: ContainerClient
 
     def __init__(self, container_name: str):
-        connstr = os.getenv("CONTENT_STORAGE_CONNSTRING")
-        if not connstr:
-            raise ValueError(
-                "CONTENT_STORAGE_CONNSTRING is required. Configure your environment."
-            )
-        self.blob_service_client = BlobServiceClient.from_connection_string(connstr)
+        connstr = _get_connection_string()
+        self.blob_service_client = BlobServiceClient.from_connection_string(
+            connstr,
+            transport=_build_transport(),
+            max_single_get_size=MAX_SINGLE_GET_SIZE,
+            max_chunk_get_size=MAX_CHUNK_GET_SIZE,
+        )
         self.container_client = self.blob_service_client.get_container_client(
             container_name
         )
@@ -32,16 +73,30 @@ class AzureBlobContainer:
             )
         ]
 
+    def probe_prefix(self, prefix: str) -> dict[str, BlobProperties]:
+        """
+        Fetch the properties of every blob under a prefix in a single listing.
+
+        :return: A mapping of blob name to its properties.
+        """
+        return {
+            blob.name: blob
+            for blob in self.container_client.list_blobs(name_starts_with=prefix)
+        }
+
     def get_bytes(self, blob_name: str) -> bytes | None:
         blob_client = self.container_client.get_blob_client(blob_name)
-        if not blob_client.exists():
+        try:
+            downloaded_blob = blob_client.download_blob(max_concurrency=MAX_CONCURRENCY)
+        except ResourceNotFoundError:
             return None
-        downloaded_blob = blob_client.download_blob()
         return downloaded_blob.readall()
 
     def set_bytes(self, blob_name: str, blob_bytes: bytes | str) -> None:
         blob_client = self.container_client.get_blob_client(blob_name)
-        blob_client.upload_blob(blob_bytes, overwrite=True)
+        blob_client.upload_blob(
+            blob_bytes, overwrite=True, max_concurrency=MAX_CONCURRENCY
+        )
 
     def exists(self, blob_name: str) -> bool:
         blob_client = self.container_client.get_blob_client(blob_name)
@@ -53,11 +108,59 @@ class AzureBlobContainer:
 
     def get_blob_date(self, blob_name: str) -> datetime | None:
         blob_client = self.container_client.get_blob_client(blob_name)
-        if not blob_client.exists():
+        try:
+            blob_properties = blob_client.get_blob_properties()
+        except ResourceNotFoundError:
             return None
-        blob_properties = blob_client.get_blob_properties()
         return blob_properties.creation_time
 
 
+class AsyncAzureBlobContainer:
+    """
+    Read-side asyncio counterpart of AzureBlobContainer, used to issue
+    independent probes concurrently.
+    """
+
+    container_client: AsyncContainerClient
+
+    def __init__(self, container_name: str):
+        connstr = _get_connection_string()
+        self.blob_service_client = AsyncBlobServiceClient.from_connection_string(
+            connstr,
+            max_single_get_size=MAX_SINGLE_GET_SIZE,
+            max_chunk_get_size=MAX_CHUNK_GET_SIZE,
+        )
+        self.container_client = self.blob_service_client.get_container_client(
+            container_name
+        )
+
+    async def get_bytes(self, blob_name: str) -> bytes | None:
+        blob_client = self.container_client.get_blob_client(blob_name)
+        try:
+            downloaded_blob = await blob_client.download_blob(
+                max_concurrency=MAX_CONCURRENCY
+            )
+        except ResourceNotFoundError:
+            return None
+        return await downloaded_blob.readall()
+
+    async def probe_prefix(self, prefix: str) -> dict[str, BlobProperties]:
+        """
+        Fetch the properties of every blob under a prefix in a single listing.
+
+        :return: A mapping of blob name to its properties.
+        """
+        return {
+            blob.name: blob
+            async for blob in self.container_client.list_blobs(name_starts_with=prefix)
+        }
+
+
+@lru_cache(maxsize=1)
 def get_content_by_hash_container() -> AzureBlobContainer:
     return AzureBlobContainer("content-by-hash")
+
+
+@lru_cache(maxsize=1)
+def get_async_content_by_hash_container() -> AsyncAzureBlobContainer:
+    return AsyncAzureBlobContainer("content-by-hash")
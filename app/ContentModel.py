@@ -1,6 +1,11 @@
+import os
 from typing import List
 
-from pydantic import BaseModel
+from blake3 import blake3
+from pydantic import BaseModel, TypeAdapter
+
+# Below this size the thread pool setup costs more than it saves.
+PARALLEL_HASH_MIN_SIZE = 1 << 20
 
 BINARY_EXTENSIONS = {
     ".pdf",
@@ -24,6 +29,7 @@ TEXT_EXTENSIONS = {
     ".txt",
     ".xml",
 }
+SUPPORTED_EXTENSIONS = frozenset(BINARY_EXTENSIONS | TEXT_EXTENSIONS)
 
 
 SUPPORTED_MIME_TYPES = {
@@ -51,17 +57,30 @@ def is_supported_attachment(filename: str | None) -> bool:
     """
     Check if an attachment is of a supported file type.
     """
-    if filename is None:
+    if not filename:
         return False
-    ext = filename.split(".")[-1].lower() if "." in filename else None
-    return ext in BINARY_EXTENSIONS or ext in TEXT_EXTENSIONS if ext else False
+    return os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS
 
 
 def is_supported_mime_type(content_type: str) -> bool:
     """
     Check if a MIME type is supported.
     """
-    return content_type.lower() in SUPPORTED_MIME_TYPES.keys()
+    # Keys are lowercase, so only lower() when the header was not.
+    return (
+        content_type in SUPPORTED_MIME_TYPES
+        or content_type.lower() in SUPPORTED_MIME_TYPES
+    )
+
+
+def content_hash(content: bytes) -> str:
+    """
+    Compute the BLAKE3 hex digest used to address content in storage.
+    Large payloads are hashed with BLAKE3's multithreaded tree mode.
+    """
+    if len(content) >= PARALLEL_HASH_MIN_SIZE:
+        return blake3(content, max_threads=blake3.AUTO).hexdigest()
+    return blake3(content).hexdigest()
 
 
 class ContentModel(BaseModel):
@@ -74,3 +93,7 @@ class ContentModel(BaseModel):
     markdown_date: str | None = None
     attachment_hashes: List[str] = []
     chunk_date: str | None = None
+
+
+# Serializes straight to bytes, skipping the str -> UTF-8 round trip.
+CONTENT_MODEL_ADAPTER = TypeAdapter(ContentModel)
@@ -1,82 +1,160 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from blake3 import blake3
-from app.ContentModel import SUPPORTED_MIME_TYPES, ContentModel
-from app.AzureContainer import AzureBlobContainer, get_content_by_hash_container
+from functools import lru_cache
+from threading import Lock
+from typing import Mapping
+from cachetools import TTLCache
+from app.ContentModel import (
+    CONTENT_MODEL_ADAPTER,
+    SUPPORTED_MIME_TYPES,
+    ContentModel,
+    content_hash,
+)
+from app.AzureContainer import (
+    AsyncAzureBlobContainer,
+    AzureBlobContainer,
+    get_async_content_by_hash_container,
+    get_content_by_hash_container,
+)
 from app.DoclingService import DoclingService
 from docling_core.types.doc.document import DoclingDocument
 
+STATUS_CACHE_SIZE = 4096
+STATUS_CACHE_TTL = 60  # seconds
+# One conversion at a time, as when the endpoint ran the work inline.
+CONVERSION_WORKERS = 1
+
+
+@lru_cache(maxsize=1)
+def get_conversion_executor() -> ThreadPoolExecutor:
+    """
+    Shared pool running the blocking conversion work off the event loop.
+    """
+    return ThreadPoolExecutor(
+        max_workers=CONVERSION_WORKERS, thread_name_prefix="conversion"
+    )
+
 
 class ContentService:
 
     _blobs: AzureBlobContainer
+    _async_blobs: AsyncAzureBlobContainer
     _docling: DoclingService
+    _status_cache: TTLCache
+    _status_lock: Lock
 
     def __init__(self):
         self._blobs = get_content_by_hash_container()
+        self._async_blobs = get_async_content_by_hash_container()
         self._docling = DoclingService()
+        self._status_cache = TTLCache(maxsize=STATUS_CACHE_SIZE, ttl=STATUS_CACHE_TTL)
+        self._status_lock = Lock()
+
+    def _get_cached_status(self, hash: str) -> ContentModel | None:
+        # Callers mutate the model they get; hand out a copy, never the entry.
+        with self._status_lock:
+            model = self._status_cache.get(hash)
+        return model.model_copy(deep=True) if model is not None else None
+
+    def _cache_status(self, model: ContentModel) -> None:
+        cached = model.model_copy(deep=True)
+        with self._status_lock:
+            self._status_cache[model.hash] = cached
 
     def get_status(self, hash: str) -> ContentModel | None:
         """
-        Get the status of the content by hash from the Azure Blob Storage.
+        Get the status of the content by hash, from the in-process cache when
+        recently read, otherwise from the Azure Blob Storage.
         """
+        model = self._get_cached_status(hash)
+        if model is not None:
+            return model
         blob_name = f"{hash}/index.json"
         blob_bytes = self._blobs.get_bytes(blob_name)
         if blob_bytes is None:
             return None
-        return ContentModel.model_validate_json(blob_bytes.decode("utf-8"))
+        model = ContentModel.model_validate_json(blob_bytes)
+        self._cache_status(model)
+        return model
 
     def save_status(self, model: ContentModel) -> None:
         """
         Save the content status to the Azure Blob Storage.
         """
         blob_name = f"{model.hash}/index.json"
-        self._blobs.set_bytes(blob_name, model.model_dump_json().encode("utf-8"))
+        self._blobs.set_bytes(blob_name, CONTENT_MODEL_ADAPTER.dump_json(model))
+        with self._status_lock:
+            self._status_cache.pop(model.hash, None)
+
+    def _get_blob_date(
+        self, blob_name: str, dates: Mapping[str, datetime] | None
+    ) -> datetime | None:
+        """
+        Look the blob date up in the probed dates, or fetch it when not probed.
+        """
+        if dates is None:
+            return self._blobs.get_blob_date(blob_name)
+        return dates.get(blob_name)
+
+    def _original_blob_name(self, hash: str, content_type: str) -> str:
+        original_ext = SUPPORTED_MIME_TYPES.get(content_type, ".bin")
+        return f"{hash}/original{original_ext}"
 
     def _process_original(
-        self, model: ContentModel, original_bytes: bytes, overwrite: bool = False
+        self,
+        model: ContentModel,
+        original_bytes: bytes,
+        overwrite: bool = False,
+        dates: Mapping[str, datetime] | None = None,
     ):
         """
         Check if the original content exists in the Azure Blob Storage.
         """
-        original_ext = SUPPORTED_MIME_TYPES.get(model.content_type, ".bin")
-        blob_name = f"{model.hash}/original{original_ext}"
-        original_date = self._blobs.get_blob_date(blob_name)
+        blob_name = self._original_blob_name(model.hash, model.content_type)
+        original_date = self._get_blob_date(blob_name, dates)
         if original_date is None or overwrite:
             self._blobs.set_bytes(blob_name, original_bytes)
-            model.created_at = datetime.now(tz=timezone.utc).isoformat()
+            # created_at was stamped when the model was built for this upload.
             self.save_status(model)
         else:
             model.created_at = original_date.isoformat()
 
     def _check_markdown(
-        self, model: ContentModel, docling: DoclingDocument, overwrite: bool = False
-    ) -> str:
+        self,
+        model: ContentModel,
+        docling: DoclingDocument,
+        overwrite: bool = False,
+        dates: Mapping[str, datetime] | None = None,
+    ) -> bytes:
+        """
+        Make sure the markdown export is stored and return it UTF-8 encoded.
+        """
         blob_name = f"{model.hash}/original.md"
-        markdown_date = self._blobs.get_blob_date(blob_name)
+        markdown_date = self._get_blob_date(blob_name, dates)
         if markdown_date is None or overwrite:
-            markdown = docling.export_to_markdown()
-            self._blobs.set_bytes(blob_name, markdown.encode("utf-8"))
+            markdown_bytes = docling.export_to_markdown().encode("utf-8")
+            self._blobs.set_bytes(blob_name, markdown_bytes)
             model.markdown_date = datetime.now(tz=timezone.utc).isoformat()
             self.save_status(model)
         else:
             markdown_bytes = self._blobs.get_bytes(blob_name)
             assert markdown_bytes is not None, "Markdown bytes should not be None"
-            markdown = markdown_bytes.decode("utf-8")
-        return markdown
+        return markdown_bytes
 
-    def process(
+    def _process(
         self,
         original_bytes: bytes,
+        hash: str,
+        model: ContentModel | None,
         content_type: str,
         filename: str,
         overwrite: bool = False,
+        dates: Mapping[str, datetime] | None = None,
     ) -> ContentModel:
         """
-        Get the content by hash from the Azure Blob Storage.
-        If it does not exist, store it and return the content model.
+        Store whatever is missing for the content, given its current status.
         """
-        hash = blake3(original_bytes).hexdigest()
-        model = self.get_status(hash)
         if model is None or overwrite:
             model = ContentModel(
                 hash=hash,
@@ -85,8 +163,69 @@ class ContentService:
                 size=len(original_bytes),
                 created_at=datetime.now(tz=timezone.utc).isoformat(),
             )
-            self._process_original(model, original_bytes, overwrite)
-        docling = self._docling.get_docling(model, original_bytes, overwrite)
+            self._process_original(model, original_bytes, overwrite, dates)
+        docling = self._docling.get_docling(
+            model, original_bytes, overwrite, dates=dates
+        )
         if model.markdown_date is None:
-            self._check_markdown(model, docling, overwrite)
+            self._check_markdown(model, docling, overwrite, dates)
         return model
+
+    def process(
+        self,
+        original_bytes: bytes,
+        content_type: str,
+        filename: str,
+        overwrite: bool = False,
+    ) -> ContentModel:
+        """
+        Get the content by hash from the Azure Blob Storage.
+        If it does not exist, store it and return the content model.
+        """
+        hash = content_hash(original_bytes)
+        # One listing answers every existence/date probe under this hash.
+        blobs = self._blobs.probe_prefix(f"{hash}/")
+        dates = {name: blob.creation_time for name, blob in blobs.items()}
+        model = self.get_status(hash) if f"{hash}/index.json" in blobs else None
+        return self._process(
+            original_bytes, hash, model, content_type, filename, overwrite, dates
+        )
+
+    async def process_async(
+        self,
+        original_bytes: bytes,
+        content_type: str,
+        filename: str,
+        overwrite: bool = False,
+        precomputed_hash: str | None = None,
+    ) -> ContentModel:
+        """
+        Same as process, but probes the status and the stored blobs concurrently
+        and runs the conversion on the bounded conversion pool.
+        A hash already computed while receiving the bytes can be passed in.
+        """
+        hash = precomputed_hash or content_hash(original_bytes)
+        # Same single listing as process, sent alongside the index read.
+        probe = self._async_blobs.probe_prefix(f"{hash}/")
+        model = self._get_cached_status(hash)
+        if model is None:
+            blobs, index_bytes = await asyncio.gather(
+                probe, self._async_blobs.get_bytes(f"{hash}/index.json")
+            )
+            if index_bytes is not None:
+                model = ContentModel.model_validate_json(index_bytes)
+                self._cache_status(model)
+        else:
+            blobs = await probe
+        dates = {name: blob.creation_time for name, blob in blobs.items()}
+        return await asyncio.get_running_loop().run_in_executor(
+            get_conversion_executor(),
+            self._process,
+            original_bytes,
+            hash,
+            model,
+            content_type,
+            filename,
+            overwrite,
+            dates,
+        )
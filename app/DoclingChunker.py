@@ -1,48 +1,110 @@
 import re
-from typing import Counter, List, Set
+from typing import Counter, Iterable, List, Set
+
+import ahocorasick
+
+
+BOILERPLATE_KEYWORDS = [
+    "no part may be copied",
+    "is provided only to investment professionals",
+    "this document is not a research report or research material",
+    "this message is for information purposes only",
+    "this document is being provided for the exclusive use of",
+]
+
+
+def _build_boilerplate_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for kw in BOILERPLATE_KEYWORDS:
+        # Chunks are matched lowercased, so the keywords must be too.
+        automaton.add_word(kw.lower(), kw)
+    automaton.make_automaton()
+    return automaton
+
+
+_BOILERPLATE_AC = _build_boilerplate_automaton()
+_METADATA_WORDS_RE = re.compile(r"\bphone\b|\bfax\b")
+# Every remaining metadata pattern needs a digit, an "@" or a ":", so prose
+# without any of them skips the expensive alternation altogether.
+_METADATA_TRIGGER_RE = re.compile(r"[\d@:]")
+_METADATA_RE = re.compile(
+    r"\bpage \d+\b"
+    r"|\+\d{1,3}[\s\-]?\d{3}"
+    # Only the word character nearest the "@" is needed to detect an address;
+    # a leading \b[\w\.-]+ rescans the whole run from every boundary in it.
+    r"|\w[\.-]*@[\w\.-]+\.\w+\b"
+    r"|https?://\S+"
+)
 
 
 def is_good_chunk(chunk: str) -> bool:
     """
     Check if a chunk is a good candidate for processing.
     """
+    if not chunk or chunk.isspace():
+        return False
     text = chunk.strip().lower()
-    boilerplate_keywords = [
-        "no part may be copied",
-        "is provided only to investment professionals",
-        "this document is not a research report or research material",
-        "this message is for information purposes only",
-        "this document is being provided for the exclusive use of",
-    ]
-    is_boilerplate = any(kw in chunk for kw in boilerplate_keywords)
-    has_metadata = bool(
-        re.search(r"\bpage \d+\b", text)
-        or re.search(r"\bphone\b|\bfax\b", text)
-        or re.search(r"\+\d{1,3}[\s\-]?\d{3}", text)
-        or re.search(r"\b[\w\.-]+@[\w\.-]+\.\w+\b", text)
-        or re.search(r"https?://[^\s]+", text)
-    )
-    return not is_boilerplate and not has_metadata
-
-
-def clean_chunk(text: str, repeated_chunks: Set[str]) -> str:
+    if next(_BOILERPLATE_AC.iter(text), None) is not None:
+        return False
+    if _METADATA_WORDS_RE.search(text) is not None:
+        return False
+    if _METADATA_TRIGGER_RE.search(text) is None:
+        return True
+    return _METADATA_RE.search(text) is None
+
+
+def clean_chunk(text: str, repeated: ahocorasick.Automaton | None) -> str:
     """
     Clean a chunk by removing repeated chunks and boilerplate text.
     """
-    for rc in repeated_chunks:
-        text = text.replace(rc, "")
-    return text
+    if repeated is None:
+        return text
+    # Every match comes out of one scan; sorting by (start, -length) lets us
+    # keep the leftmost-longest non-overlapping ones, like a longest-first
+    # regex alternation would.
+    matches = sorted((end - length + 1, -length) for end, length in repeated.iter(text))
+    if not matches:
+        return text
+    pieces = []
+    last = 0
+    for start, neg_length in matches:
+        if start < last:
+            continue
+        pieces.append(text[last:start])
+        last = start - neg_length
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def compile_repeated(repeated_chunks: Set[str]) -> ahocorasick.Automaton | None:
+    """
+    Build an Aho-Corasick automaton over the repeated chunks, so all of them
+    can be found in one linear scan regardless of how many there are.
+    """
+    repeated = ahocorasick.Automaton()
+    for chunk in repeated_chunks:
+        if chunk:
+            repeated.add_word(chunk, len(chunk))
+    if len(repeated) == 0:
+        return None
+    repeated.make_automaton()
+    return repeated
 
 
-def filter_chunks(chunks) -> List[str]:
+def filter_chunks(chunks: Iterable[str]) -> List[str]:
     """
     Filter out duplicate chunks and boilerplate text.
+    Accepts any iterable, e.g. a generator over a chunker's output.
     """
+    if not isinstance(chunks, list):
+        chunks = list(chunks)  # counted and then walked, so read it once
     chunk_counts = Counter(chunks)
-    repeated_chunks = {c for c, count in chunk_counts.items() if count > 1}
-    return [
-        clean_chunk(chunk, repeated_chunks)
-        for chunk in chunks
-        if chunk_counts[chunk] == 1  # remove duplicates
-        and is_good_chunk(chunk)  # remove boilerplate and metadata
-    ]
+    repeated = compile_repeated({c for c, count in chunk_counts.items() if count > 1})
+    filtered = []
+    for chunk in chunks:
+        if chunk_counts[chunk] != 1:  # remove duplicates before any matching work
+            continue
+        if not is_good_chunk(chunk):  # remove boilerplate and metadata
+            continue
+        filtered.append(clean_chunk(chunk, repeated))
+    return filtered
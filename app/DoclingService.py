@@ -1,26 +1,80 @@
-from email import message_from_bytes, policy
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from email import policy
 from email.message import EmailMessage
+from email.parser import BytesParser
+from functools import lru_cache
 from io import BytesIO
+import os
+from threading import Lock
+from typing import Dict, Iterator, List, Mapping, Tuple
+from cachetools import LFUCache
+from pydantic import TypeAdapter
 from docling_core.types.io import DocumentStream
 from docling_core.types.doc.document import DoclingDocument
 from docling_core.types.doc.labels import DocItemLabel
 from docling.document_converter import DocumentConverter
 
 from app.AzureContainer import AzureBlobContainer, get_content_by_hash_container
-from app.ContentModel import SUPPORTED_MIME_TYPES, ContentModel, is_supported_mime_type
+from app.ContentModel import (
+    SUPPORTED_MIME_TYPES,
+    ContentModel,
+    content_hash,
+    is_supported_mime_type,
+)
 
 from docling_core.types.doc.document import DoclingDocument
 from app.docling_add_doc import docling_add_doc
 
+# dump_json() returns bytes from pydantic-core, no intermediate str.
+_DOCLING_ADAPTER = TypeAdapter(DoclingDocument)
+
+# Stateless between calls: parsebytes() builds a fresh FeedParser each time.
+_EMAIL_PARSER = BytesParser(_class=EmailMessage, policy=policy.default)
+
+DOCUMENT_CACHE_SIZE = 128
+ATTACHMENT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+# The shared DocumentConverter is not known to be thread-safe; every
+# convert() call goes through this lock. Text parts still run in parallel.
+_CONVERTER_LOCK = Lock()
+
+
+@lru_cache(maxsize=1)
+def get_document_converter() -> DocumentConverter:
+    """
+    Shared DocumentConverter, so Docling's pipelines load once per process.
+    """
+    return DocumentConverter()
+
+
+@lru_cache(maxsize=1)
+def get_attachment_executor() -> ThreadPoolExecutor:
+    """
+    Shared pool converting email attachments side by side. Calls into the
+    DocumentConverter are serialized by _CONVERTER_LOCK.
+    """
+    return ThreadPoolExecutor(
+        max_workers=ATTACHMENT_WORKERS, thread_name_prefix="attachment"
+    )
+
 
 class DoclingService:
 
     _converter: DocumentConverter
     _blobs: AzureBlobContainer
+    _pool: ThreadPoolExecutor
+    _documents: LFUCache
+    _documents_lock: Lock
 
     def __init__(self) -> None:
-        self._converter = DocumentConverter()
+        self._converter = get_document_converter()
         self._blobs = get_content_by_hash_container()
+        self._pool = get_attachment_executor()
+        # Converted documents by content hash; popular uploads stay resident.
+        self._documents = LFUCache(maxsize=DOCUMENT_CACHE_SIZE)
+        self._documents_lock = Lock()
 
     def _process_text_content(
         self, content_bytes: bytes, filename: str, encoding: str = "utf-8"
@@ -40,7 +94,8 @@ class DoclingService:
         Process generic content and convert it to a DoclingDocument.
         """
         stream = DocumentStream(name=filename, stream=BytesIO(content_bytes))
-        return self._converter.convert(stream).document
+        with _CONVERTER_LOCK:
+            return self._converter.convert(stream).document
 
     def _process_email_singlepart(
         self, msg: EmailMessage, filename: str
@@ -54,37 +109,103 @@ class DoclingService:
         encoding = msg.get_content_charset() or "utf-8"
         return self._process(payload, content_type, filename, encoding)
 
+    def _process_email_part(
+        self, part: EmailMessage, part_bytes: bytes | None = None
+    ) -> DoclingDocument | None:
+        """
+        Convert a single email body or attachment part to a DoclingDocument.
+        The decoded payload can be passed in when the caller already has it.
+        Returns None for unsupported or empty parts.
+        """
+        content_type = part.get_content_type()
+        if not is_supported_mime_type(content_type):
+            return None
+        part_filename = part.get_filename()
+        if not part_filename:
+            part_filename = (
+                f"attachment{SUPPORTED_MIME_TYPES.get(content_type, '.bin')}"
+            )
+        if content_type == "message/rfc822":
+            # Attached emails are already parsed; hand the message down as is.
+            return self._process_email_message(part.get_content(), part_filename)
+        if part_bytes is None:
+            part_bytes = part.get_payload(decode=True)  # type: ignore
+        if not part_bytes:
+            return None
+        encoding = part.get_content_charset() or "utf-8"
+        return self._process(part_bytes, content_type, part_filename, encoding)
+
+    def _process_email_parts(
+        self, parts: List[EmailMessage]
+    ) -> Iterator[DoclingDocument | None]:
+        """
+        Convert email parts concurrently, yielding the results in part order.
+        Attached emails are converted on the calling thread: they submit their
+        own parts to the pool, and blocking a worker on them could starve it.
+        """
+        # The same disclaimer or logo is often attached several times; parts
+        # with identical type, charset and payload share a single conversion.
+        submitted: Dict[Tuple[str, str | None, str], Future] = {}
+        futures: List[Future | None] = []
+        for part in parts:
+            content_type = part.get_content_type()
+            if content_type == "message/rfc822" or not is_supported_mime_type(
+                content_type
+            ):
+                futures.append(None)
+                continue
+            part_bytes: bytes = part.get_payload(decode=True) or b""  # type: ignore
+            key = (content_type, part.get_content_charset(), content_hash(part_bytes))
+            future = submitted.get(key)
+            if future is None:
+                future = self._pool.submit(self._process_email_part, part, part_bytes)
+                submitted[key] = future
+            futures.append(future)
+        for part, future in zip(parts, futures):
+            if future is None:
+                yield self._process_email_part(part)
+            else:
+                yield future.result()
+
     def _process_email_multipart(
         self, msg: EmailMessage, filename: str
     ) -> DoclingDocument:
         """
-        Process a multipart email and convert each part to a DoclingDocument.
+        Process a multipart email and convert its body and attachments to a
+        DoclingDocument.
         """
         doc = DoclingDocument(name=msg.get_filename() or filename)
-        for part in msg.walk():
-            part_bytes: bytes = part.get_payload(decode=True)  # type: ignore
-            content_type = part.get_content_type()
-            encoding = part.get_content_charset() or "utf-8"
-            if not is_supported_mime_type(content_type) or not part_bytes:
-                continue
-            part_filename = part.get_filename()
-            if not part_filename:
-                part_filename = (
-                    f"attachment{SUPPORTED_MIME_TYPES.get(content_type, '.bin')}"
+        body = msg.get_body(preferencelist=("html", "plain"))
+        parts = [body] if body is not None else []
+        # Inline parts (e.g. cid images) of a nested multipart/related body.
+        related = msg.get_body(preferencelist=("related",))
+        if related is not None and related is not msg:
+            parts.extend(related.iter_attachments())
+        parts.extend(msg.iter_attachments())
+        # Duplicate parts share one result; copy it on every merge after the
+        # first so no two merged items share nested objects.
+        merged = set()
+        for part_docling in self._process_email_parts(parts):
+            if part_docling is not None:
+                docling_add_doc(
+                    doc, part_docling, preserve_source=id(part_docling) in merged
                 )
-            part_docling = self._process(
-                part_bytes, content_type, part_filename, encoding
-            )
-            docling_add_doc(doc, part_docling)
+                merged.add(id(part_docling))
         return doc
 
     def _process_email(self, original_bytes: bytes, filename: str) -> DoclingDocument:
         """
         Convert email content to DoclingDocument format.
         """
-        msg = message_from_bytes(
-            original_bytes, policy=policy.default, _class=EmailMessage
-        )
+        msg: EmailMessage = _EMAIL_PARSER.parsebytes(original_bytes)  # type: ignore
+        return self._process_email_message(msg, filename)
+
+    def _process_email_message(
+        self, msg: EmailMessage, filename: str
+    ) -> DoclingDocument:
+        """
+        Convert an already parsed email message to DoclingDocument format.
+        """
         if msg.is_multipart():
             return self._process_email_multipart(msg, filename)
         else:
@@ -113,15 +234,26 @@ class DoclingService:
         original_bytes: bytes,
         overwrite: bool = False,
         attempt: int = 0,
+        dates: Mapping[str, datetime] | None = None,
     ) -> DoclingDocument:
         """
         Process the original bytes and convert them to a DoclingDocument.
+        Blob dates already probed by the caller can be passed in `dates`.
         """
+        if not overwrite:
+            with self._documents_lock:
+                docling = self._documents.get(model.hash)
+            if docling is not None:
+                return docling
         blob_name = f"{model.hash}/docling.json"
-        docling_date = self._blobs.get_blob_date(blob_name)
+        docling_date = (
+            self._blobs.get_blob_date(blob_name)
+            if dates is None
+            else dates.get(blob_name)
+        )
         if docling_date is None or overwrite:
             docling = self._process(original_bytes, model.content_type, model.filename)
-            self._blobs.set_bytes(blob_name, docling.model_dump_json().encode("utf-8"))
+            self._blobs.set_bytes(blob_name, _DOCLING_ADAPTER.dump_json(docling))
         else:
             docling_bytes = self._blobs.get_bytes(blob_name)
             if docling_bytes is None:
@@ -133,9 +265,7 @@ class DoclingService:
                     return self.get_docling(model, original_bytes, True, attempt + 1)
             else:
                 try:
-                    docling = DoclingDocument.model_validate_json(
-                        docling_bytes.decode("utf-8")
-                    )
+                    docling = DoclingDocument.model_validate_json(docling_bytes)
                 except Exception as e:
                     if attempt > 0:
                         raise e
@@ -143,4 +273,6 @@ class DoclingService:
                         return self.get_docling(
                             model, original_bytes, True, attempt + 1
                         )
+        with self._documents_lock:
+            self._documents[model.hash] = docling
         return docling
@@ -1,4 +1,5 @@
 import copy
+from typing import Any, Callable, Dict
 from docling_core.types.doc.document import (
     DoclingDocument,
     TitleItem,
@@ -15,168 +16,281 @@ from docling_core.types.doc.document import (
 from docling_core.types.doc.labels import GroupLabel
 
 
-def _merge_node(
-    target_doc: DoclingDocument, target_parent, source_node, source_doc: DoclingDocument
-):
+def _get_prov(node):
+    """
+    Extract a single provenance item (if available).
     """
-    Recursively merge one node (and its subtree) from the source document into the target document.
+    return node.prov[0] if getattr(node, "prov", None) and len(node.prov) > 0 else None
 
-    Parameters:
-      target_doc (DoclingDocument): The document which is being added to.
-      target_parent: The parent node in the target document.
-      source_node: The node from the source document to merge.
-      source_doc (DoclingDocument): The full source document (used for resolving references).
 
-    Returns:
-      The new node created in the target document.
+def _take(value, preserve_source: bool):
     """
+    Hand a source payload (table data, images, graphs) over to the target.
+    The source document is normally discarded after the merge, so the payload
+    is moved by reference; it is only deep-copied when the source must stay
+    independent of the target.
+    """
+    return copy.deepcopy(value) if preserve_source else value
 
-    # Helper to extract a single provenance item (if available)
-    def get_prov(node):
-        return (
-            node.prov[0] if getattr(node, "prov", None) and len(node.prov) > 0 else None
-        )
 
-    new_item = None
-
-    # Use type checking to decide which add_* method to invoke.
-    if isinstance(source_node, TitleItem):
-        new_item = target_doc.add_title(
-            text=source_node.text,
-            orig=source_node.orig,
-            prov=get_prov(source_node),
-            parent=target_parent,
-            formatting=source_node.formatting,
-            hyperlink=source_node.hyperlink,
-        )
-    elif isinstance(source_node, SectionHeaderItem):
-        new_item = target_doc.add_heading(
-            text=source_node.text,
-            orig=source_node.orig,
-            level=source_node.level,
-            prov=get_prov(source_node),
-            parent=target_parent,
-            formatting=source_node.formatting,
-            hyperlink=source_node.hyperlink,
-        )
-    elif isinstance(source_node, ListItem):
-        new_item = target_doc.add_list_item(
-            text=source_node.text,
-            enumerated=source_node.enumerated,
-            marker=source_node.marker,
-            orig=source_node.orig,
-            prov=get_prov(source_node),
-            parent=target_parent,
-            formatting=source_node.formatting,
-            hyperlink=source_node.hyperlink,
-        )
-    elif isinstance(source_node, CodeItem):
-        new_item = target_doc.add_code(
-            text=source_node.text,
-            code_language=source_node.code_language,
-            orig=source_node.orig,
-            prov=get_prov(source_node),
-            parent=target_parent,
-            formatting=source_node.formatting,
-            hyperlink=source_node.hyperlink,
-        )
-    elif isinstance(source_node, FormulaItem):
-        new_item = target_doc.add_formula(
-            text=source_node.text,
-            orig=source_node.orig,
-            prov=get_prov(source_node),
-            parent=target_parent,
-            formatting=source_node.formatting,
-            hyperlink=source_node.hyperlink,
-        )
-    elif isinstance(source_node, TableItem):
-        # If at least one caption exists, choose the first one.
-        caption = (
-            source_node.captions[0].resolve(source_doc)
-            if source_node.captions
-            else None
-        )
-        new_item = target_doc.add_table(
-            data=copy.deepcopy(source_node.data),
-            caption=caption,
-            prov=get_prov(source_node),
-            parent=target_parent,
-            label=source_node.label,
-        )
-    elif isinstance(source_node, PictureItem):
-        caption = (
-            source_node.captions[0].resolve(source_doc)
-            if source_node.captions
-            else None
-        )
-        new_item = target_doc.add_picture(
-            annotations=copy.deepcopy(source_node.annotations),
-            image=copy.deepcopy(source_node.image),
-            caption=caption,
-            prov=get_prov(source_node),
-            parent=target_parent,
-        )
-    elif isinstance(source_node, KeyValueItem):
-        new_item = target_doc.add_key_values(
-            graph=copy.deepcopy(source_node.graph),
-            prov=get_prov(source_node),
-            parent=target_parent,
-        )
-    elif isinstance(source_node, FormItem):
-        new_item = target_doc.add_form(
-            graph=copy.deepcopy(source_node.graph),
-            prov=get_prov(source_node),
-            parent=target_parent,
-        )
-    elif isinstance(source_node, GroupItem):
-        # For groups we use the add_group method.
-        # Pass group label only if it is an instance of GroupLabel.
-        group_label = (
-            source_node.label if isinstance(source_node.label, GroupLabel) else None
-        )
-        new_item = target_doc.add_group(
-            label=group_label,
-            name=getattr(source_node, "name", None),
-            parent=target_parent,
+def _add_title(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_title(
+        text=source_node.text,
+        orig=source_node.orig,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        formatting=source_node.formatting,
+        hyperlink=source_node.hyperlink,
+    )
+
+
+def _add_heading(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_heading(
+        text=source_node.text,
+        orig=source_node.orig,
+        level=source_node.level,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        formatting=source_node.formatting,
+        hyperlink=source_node.hyperlink,
+    )
+
+
+def _add_list_item(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_list_item(
+        text=source_node.text,
+        enumerated=source_node.enumerated,
+        marker=source_node.marker,
+        orig=source_node.orig,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        formatting=source_node.formatting,
+        hyperlink=source_node.hyperlink,
+    )
+
+
+def _add_code(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_code(
+        text=source_node.text,
+        code_language=source_node.code_language,
+        orig=source_node.orig,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        formatting=source_node.formatting,
+        hyperlink=source_node.hyperlink,
+    )
+
+
+def _add_formula(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_formula(
+        text=source_node.text,
+        orig=source_node.orig,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        formatting=source_node.formatting,
+        hyperlink=source_node.hyperlink,
+    )
+
+
+def _add_table(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    # If at least one caption exists, choose the first one.
+    caption = (
+        source_node.captions[0].resolve(source_doc) if source_node.captions else None
+    )
+    return target_doc.add_table(
+        data=_take(source_node.data, preserve_source),
+        caption=caption,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        label=source_node.label,
+    )
+
+
+def _add_picture(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    caption = (
+        source_node.captions[0].resolve(source_doc) if source_node.captions else None
+    )
+    return target_doc.add_picture(
+        annotations=_take(source_node.annotations, preserve_source),
+        image=_take(source_node.image, preserve_source),
+        caption=caption,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+    )
+
+
+def _add_key_values(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_key_values(
+        graph=_take(source_node.graph, preserve_source),
+        prov=_get_prov(source_node),
+        parent=target_parent,
+    )
+
+
+def _add_form(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    return target_doc.add_form(
+        graph=_take(source_node.graph, preserve_source),
+        prov=_get_prov(source_node),
+        parent=target_parent,
+    )
+
+
+def _add_group(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    # Pass group label only if it is an instance of GroupLabel.
+    group_label = (
+        source_node.label if isinstance(source_node.label, GroupLabel) else None
+    )
+    return target_doc.add_group(
+        label=group_label,
+        name=getattr(source_node, "name", None),
+        parent=target_parent,
+    )
+
+
+def _add_text(
+    target_doc: DoclingDocument,
+    target_parent,
+    source_node,
+    source_doc: DoclingDocument,
+    preserve_source: bool,
+):
+    # Fallback: if the node has a text attribute we add it as a generic text item.
+    if not hasattr(source_node, "text"):
+        return None
+    return target_doc.add_text(
+        label=source_node.label,
+        text=source_node.text,
+        orig=source_node.orig,
+        prov=_get_prov(source_node),
+        parent=target_parent,
+        formatting=source_node.formatting,
+        hyperlink=source_node.hyperlink,
+    )
+
+
+_Handler = Callable[[DoclingDocument, Any, Any, DoclingDocument, bool], Any]
+
+# Exact node type -> add_* handler. Subclasses are resolved through their MRO
+# on first sight and memoized here, so each node costs a single dict lookup.
+_HANDLERS: Dict[type, _Handler] = {
+    TitleItem: _add_title,
+    SectionHeaderItem: _add_heading,
+    ListItem: _add_list_item,
+    CodeItem: _add_code,
+    FormulaItem: _add_formula,
+    TableItem: _add_table,
+    PictureItem: _add_picture,
+    KeyValueItem: _add_key_values,
+    FormItem: _add_form,
+    GroupItem: _add_group,
+}
+
+
+def _get_handler(node_type: type) -> _Handler:
+    handler = _HANDLERS.get(node_type)
+    if handler is None:
+        handler = next(
+            (_HANDLERS[cls] for cls in node_type.__mro__ if cls in _HANDLERS),
+            _add_text,
         )
-    else:
-        # Fallback: if the node has a text attribute we add it as a generic text item.
-        if hasattr(source_node, "text"):
-            new_item = target_doc.add_text(
-                label=source_node.label,
-                text=source_node.text,
-                orig=source_node.orig,
-                prov=get_prov(source_node),
-                parent=target_parent,
-                formatting=source_node.formatting,
-                hyperlink=source_node.hyperlink,
-            )
-
-    # Now, if we created a new item, merge all its children recursively.
-    if new_item is not None:
-        for child_ref in source_node.children:
-            source_child = child_ref.resolve(source_doc)
-            _merge_node(target_doc, new_item, source_child, source_doc)
-
-    return new_item
-
-
-def docling_add_doc(target: DoclingDocument, source: DoclingDocument) -> None:
+        _HANDLERS[node_type] = handler
+    return handler
+
+
+def docling_add_doc(
+    target: DoclingDocument, source: DoclingDocument, preserve_source: bool = False
+) -> None:
     """
     Merge all elements from the source DoclingDocument into the target DoclingDocument.
 
-    This function iterates over the top-level items in the source document's body and
-    copies their entire subtree into the target document using the target document's
-    add_* methods. (Note that merging of pages or the furniture section is not handled here.)
+    This function walks the source document's body and copies every subtree into the
+    target document using the target document's add_* methods. (Note that merging of
+    pages or the furniture section is not handled here.)
+
+    The walk uses an explicit stack instead of recursion, visiting nodes in the same
+    pre-order as a recursive walk, so deep documents cannot hit the recursion limit.
 
     Parameters:
       target (DoclingDocument): The document that will receive the new elements.
       source (DoclingDocument): The document whose elements will be added into target.
+      preserve_source (bool): Deep-copy table data, images and graphs instead of
+        sharing them with target. Leave False when source is dropped after merging.
 
     Returns:
       None
     """
-    # Iterate over each top-level item in the source document's body.
-    for ref in source.body.children:
-        source_node = ref.resolve(source)
-        _merge_node(target, target.body, source_node, source)
+    # Each entry is (parent in target, child refs in source); children are
+    # consumed in reverse so the stack pops them in document order.
+    stack = [(target.body, list(reversed(source.body.children)))]
+    while stack:
+        target_parent, pending = stack[-1]
+        if not pending:
+            stack.pop()
+            continue
+        source_node = pending.pop().resolve(source)
+        new_item = _get_handler(type(source_node))(
+            target, target_parent, source_node, source, preserve_source
+        )
+        # Only descend when a new item was created, mirroring the node itself.
+        if new_item is not None and source_node.children:
+            stack.append((new_item, list(reversed(source_node.children))))
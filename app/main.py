@@ -1,11 +1,19 @@
+import asyncio
 import os
 
 import uvicorn
+from blake3 import blake3
 from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-from app.ContentModel import is_supported_mime_type, SUPPORTED_MIME_TYPES
+from app.ContentModel import (
+    CONTENT_MODEL_ADAPTER,
+    PARALLEL_HASH_MIN_SIZE,
+    SUPPORTED_MIME_TYPES,
+    content_hash,
+    is_supported_mime_type,
+)
 from app.ContentService import ContentService
 
 app = FastAPI()
@@ -16,12 +24,32 @@ API_KEY = os.getenv("DOC_API_KEY", "my-secret-key")
 service = ContentService()
 
 
+async def read_body_and_hash(request: Request) -> tuple[bytes, str]:
+    """
+    Read the request body while hashing it, so the hash of a small body is
+    ready as soon as the last chunk arrives. Large bodies are hashed once
+    received, with the multithreaded content_hash, off the event loop.
+    """
+    hasher = blake3()
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size < PARALLEL_HASH_MIN_SIZE:
+            hasher.update(chunk)
+    body = b"".join(chunks)
+    if size >= PARALLEL_HASH_MIN_SIZE:
+        return body, await asyncio.to_thread(content_hash, body)
+    return body, hasher.hexdigest()
+
+
 @app.post("/parse")
 async def parse_document(request: Request, x_api_key: str = Header(...)):
     if x_api_key != API_KEY:
         raise HTTPException(status_code=403, detail="Invalid API key")
     try:
-        contents = await request.body()
+        contents, contents_hash = await read_body_and_hash(request)
         if not contents:
             raise HTTPException(status_code=400, detail="No content provided")
         content_type = request.headers.get("Content-Type")
@@ -30,6 +58,8 @@ async def parse_document(request: Request, x_api_key: str = Header(...)):
                 status_code=400,
                 detail="No content type provided. Please add the Content-Type header",
             )
+        # Normalize once; every lookup downstream is keyed by lowercase types.
+        content_type = content_type.lower()
         if not is_supported_mime_type(content_type):
             raise HTTPException(
                 status_code=400,
@@ -39,8 +69,15 @@ async def parse_document(request: Request, x_api_key: str = Header(...)):
         if not filename:
             filename = f"uploadedfile{SUPPORTED_MIME_TYPES[content_type]}"
         overwrite = request.headers.get("overwrite", "false").lower() == "true"
-        result = service.process(contents, content_type, filename, overwrite)
-        return JSONResponse(content=result.model_dump())
+        result = await service.process_async(
+            contents, content_type, filename, overwrite, contents_hash
+        )
+        # JSON bytes straight from pydantic-core, skipping the dict and the
+        # JSONResponse json.dumps + encode pass.
+        return Response(
+            content=CONTENT_MODEL_ADAPTER.dump_json(result),
+            media_type="application/json",
+        )
     except Exception as e:
         return JSONResponse(content={"error": str(e)}, status_code=500)
 